@@ -6,13 +6,15 @@ from typing import Optional, Dict, Any, AsyncGenerator
 import aiohttp
 import asyncio
 import logging
-import json
+import orjson
 from config import config
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Canned replies returned by get_response when the API gives nothing usable
+EMPTY_RESPONSE = "I apologize, but I couldn't generate a response."
+ERROR_RESPONSE = "I'm having trouble processing your request."
+
 class GPTTrainerAPIError(Exception):
     """Base exception for API errors."""
     pass
@@ -42,22 +44,32 @@ class GPTTrainerAPI:
         self._lock = asyncio.Lock()
         self.timeout = aiohttp.ClientTimeout(total=30, connect=10)
 
+    async def startup(self) -> None:
+        """Create the shared session and its keep-alive connection pool if needed."""
+        if not self._session or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=120, ttl_dns_cache=300)
+            )
+
+    async def aclose(self) -> None:
+        """Close the shared session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+
     async def __aenter__(self):
         """Create session if needed."""
-        if not self._session:
-            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        await self.startup()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Cleanup session."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        await self.aclose()
 
     async def _make_request(self, method: str, endpoint: str, retries: int = 3, **kwargs) -> Dict[str, Any]:
         """Make an API request with retry logic."""
-        if not self._session:
-            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        await self.startup()
 
         url = f'{self.base_url}/{endpoint}'
         kwargs['headers'] = self.headers
@@ -78,19 +90,19 @@ class GPTTrainerAPI:
                             last_error = ServerError(f"Server error: {response.status}")
                             if attempt < retries - 1:
                                 wait_time = (attempt + 1) * 2
-                                logger.warning(f"Server error. Retrying in {wait_time}s...")
+                                logger.warning("Server error. Retrying in %ss...", wait_time)
                                 await asyncio.sleep(wait_time)
                                 continue
                             raise last_error
                         
                         response.raise_for_status()
-                        return await response.json()
+                        return await response.json(loads=orjson.loads)
 
             except Exception as e:
                 last_error = e
                 if attempt < retries - 1:
                     wait_time = (attempt + 1) * 2
-                    logger.warning(f"Request failed. Retrying in {wait_time}s...")
+                    logger.warning("Request failed. Retrying in %ss...", wait_time)
                     await asyncio.sleep(wait_time)
                     continue
                 raise APIResponseError(f"Request failed: {str(e)}")
@@ -99,8 +111,7 @@ class GPTTrainerAPI:
 
     async def _stream_response(self, endpoint: str, data: Dict[str, Any]) -> AsyncGenerator[str, None]:
         """Stream response from API."""
-        if not self._session:
-            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        await self.startup()
 
         url = f'{self.base_url}/{endpoint}'
         
@@ -117,7 +128,7 @@ class GPTTrainerAPI:
                             if decoded.strip():
                                 yield decoded
                         except Exception as e:
-                            logger.error(f"Stream decode error: {e}")
+                            logger.error("Stream decode error: %s", e)
 
     async def create_chat_session(self) -> str:
         """Create a new chat session and return session UUID."""
@@ -126,37 +137,45 @@ class GPTTrainerAPI:
             response = await self._make_request('POST', endpoint)
             return response['uuid']
         except Exception as e:
-            logger.error(f"Failed to create chat session: {e}")
+            logger.error("Failed to create chat session: %s", e)
             raise
 
+    async def stream_text(self, session_uuid: str, message: str, context: str = "") -> AsyncGenerator[str, None]:
+        """Yield AI response text as it arrives from the streaming endpoint."""
+        endpoint = f'session/{session_uuid}/message/stream'
+        query = f"{context}\n\nUser: {message}" if context else f"User: {message}"
+        
+        async for chunk in self._stream_response(endpoint, {'query': query}):
+            # Plain-text chunks can't be JSON objects; skip the parse attempt
+            if chunk.lstrip()[:1] != '{':
+                yield chunk
+                continue
+            try:
+                data = orjson.loads(chunk)
+            except orjson.JSONDecodeError:
+                yield chunk
+                continue
+            if isinstance(data, dict) and 'text' in data:
+                yield data['text']
+
     async def get_response(self, session_uuid: str, message: str, context: str = "") -> str:
         """Get AI response using streaming endpoint."""
         try:
-            endpoint = f'session/{session_uuid}/message/stream'
-            query = f"{context}\n\nUser: {message}" if context else f"User: {message}"
-            
-            response_chunks = []
-            
-            async for chunk in self._stream_response(endpoint, {'query': query}):
-                try:
-                    data = json.loads(chunk)
-                    if isinstance(data, dict) and 'text' in data:
-                        response_chunks.append(data['text'])
-                except json.JSONDecodeError:
-                    response_chunks.append(chunk)
-                    
+            response_chunks = [
+                chunk async for chunk in self.stream_text(session_uuid, message, context)
+            ]
             final_response = ''.join(response_chunks)
-            return final_response if final_response else "I apologize, but I couldn't generate a response."
+            return final_response if final_response else EMPTY_RESPONSE
                     
         except Exception as e:
-            logger.error(f"Error in get_response: {e}")
+            logger.error("Error in get_response: %s", e)
             try:
                 # Fallback to new session
                 new_session_uuid = await self.create_chat_session()
                 return await self.get_response(new_session_uuid, message, context)
             except Exception as retry_error:
-                logger.error(f"Retry failed: {retry_error}")
-                return "I'm having trouble processing your request."
+                logger.error("Retry failed: %s", retry_error)
+                return ERROR_RESPONSE
 
     async def upload_data_source(self, url: str) -> Dict[str, Any]:
         """Upload a URL to the knowledge base."""
@@ -164,7 +183,7 @@ class GPTTrainerAPI:
             endpoint = f'chatbot/{config.CHATBOT_UUID}/data-source/url'
             return await self._make_request('POST', endpoint, json={'url': url})
         except Exception as e:
-            logger.error(f"Failed to upload URL: {e}")
+            logger.error("Failed to upload URL: %s", e)
             return {'success': False, 'error': str(e)}
 
     async def summarize_content(self, url: str, content: str) -> Dict[str, Any]:
@@ -200,7 +219,7 @@ class GPTTrainerAPI:
             }
 
         except Exception as e:
-            logger.error(f"Failed to generate summary: {e}")
+            logger.error("Failed to generate summary: %s", e)
             return {'success': False, 'error': str(e)}
 
 # Create singleton instance
@@ -4,30 +4,55 @@ This bot integrates with GPT Trainer API to provide conversational AI capabiliti
 Simplified version with removed redundant processing.
 """
 
+import asyncio
+import hashlib
+import random
+import re
 import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from typing import Callable
-from api_client import api_client
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+from collections import deque
+from typing import Callable, Deque, Dict, List, Set
+from cachetools import TTLCache
+from api_client import api_client, EMPTY_RESPONSE, ERROR_RESPONSE
 from config import config
-from scraper.content_scheduler import ContentScheduler
-from openai import OpenAI
 from enum import Enum
-from scraper.content_scraper import scrape_article_content
+from types import MappingProxyType
 from functools import wraps
 
-# Configure logging
+# Configure logging (level from LOG_LEVEL, log file capped by rotation).
+# Records are queued and written by a background thread, off the event loop.
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.StreamHandler(),
+    RotatingFileHandler('bot.log', maxBytes=10_000_000, backupCount=3)
+)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=config.LOG_LEVEL.upper(),
     format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('bot.log')
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
+THINKING_PHRASES = (
+    "📜 *Consulting the ancient tomes...*",
+    "🤔 *Pondering the mysteries of the universe...*",
+    "🕸️ *Focusing my neural networks...*",
+    "👵 *Channeling the wisdom of the AI elders...*",
+    "✨ *Weaving threads of knowledge...*",
+    "🔮 *Gazing into the crystal GPU...*",
+    "📚 *Speed-reading the internet...*",
+    "🤓 *Doing some quick quantum calculations...*"
+)
+
+# Matches an image size flag such as "--portrait", plus the whitespace before it
+_SIZE_FLAG_RE = re.compile(r'\s*--(square|portrait|wide|landscape)\b', re.IGNORECASE)
+
 def with_error_handling(func: Callable) -> Callable:
     """Decorator to handle errors in async functions."""
     @wraps(func)
@@ -35,7 +60,7 @@ def with_error_handling(func: Callable) -> Callable:
         try:
             return await func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {e}", exc_info=True)
+            logger.error("Error in %s: %s", func.__name__, e, exc_info=True)
             raise
     return wrapper
 
@@ -47,50 +72,66 @@ class ImageSize(Enum):
     
     @classmethod
     def get_description(cls, size: str) -> str:
-        descriptions = {
-            "square": "Perfect square (1024x1024)",
-            "portrait": "Vertical/portrait (1024x1792)",
-            "landscape": "Horizontal/landscape (1792x1024)"
-        }
-        return descriptions.get(size.lower(), "Unknown size")
+        return _SIZE_DESCRIPTIONS.get(size.lower(), "Unknown size")
+
+_SIZE_DESCRIPTIONS = MappingProxyType({
+    "square": "Perfect square (1024x1024)",
+    "portrait": "Vertical/portrait (1024x1792)",
+    "landscape": "Horizontal/landscape (1792x1024)"
+})
+
+# Size flag name (as captured by _SIZE_FLAG_RE) -> image size
+_SIZE_FLAG_MAP = MappingProxyType({
+    "square": ImageSize.SQUARE,
+    "portrait": ImageSize.PORTRAIT,
+    "wide": ImageSize.LANDSCAPE,
+    "landscape": ImageSize.LANDSCAPE
+})
 
 class DiscordBot(commands.Bot):
     """Discord bot implementation with streamlined message handling."""
     
+    HISTORY_SIZE = 10  # Recent messages kept per channel for /prof context
+    STREAM_EDIT_INTERVAL = 1.0  # Seconds between partial-answer edits (Discord allows 5 edits per 5s)
+    FIELD_LIMIT = 1024  # Discord's limit on an embed field value
+    
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix='/', intents=intents)
         
         self.scheduler = None
-        self.openai_client = OpenAI(api_key=config.OPENAI_API_KEY)
-        self.thinking_phrases = [
-            "📜 *Consulting the ancient tomes...*",
-            "🤔 *Pondering the mysteries of the universe...*",
-            "🕸️ *Focusing my neural networks...*",
-            "👵 *Channeling the wisdom of the AI elders...*",
-            "✨ *Weaving threads of knowledge...*",
-            "🔮 *Gazing into the crystal GPU...*",
-            "📚 *Speed-reading the internet...*",
-            "🤓 *Doing some quick quantum calculations...*"
-        ]
+        # Recent first-turn answers keyed by a digest of (normalized prompt, channel context)
+        self._response_cache = TTLCache(maxsize=256, ttl=3600)
+        # GPT Trainer chat session per (user id, channel id), kept once it has
+        # answered and reused for 30 minutes
+        self._session_cache = TTLCache(maxsize=1000, ttl=1800)
+        # Recent messages per channel id, oldest first, kept current by on_message
+        self._recent_messages: Dict[int, Deque[discord.Message]] = {}
+        # In-progress history fetches per channel id, shared by concurrent /prof calls
+        self._history_seeds: Dict[int, asyncio.Task] = {}
+        self.openai_client = None  # Created on first /image
 
     async def setup_hook(self):
         """Initialize bot commands and scheduler."""
         logger.info("Starting bot setup...")
+        # Open one long-lived API session so every command reuses its connection pool
+        await api_client.startup()
         try:
             await self.tree.sync()
             logger.info("Command tree synced")
         except Exception as e:
-            logger.error(f"Error in setup_hook: {e}", exc_info=True)
+            logger.error("Error in setup_hook: %s", e, exc_info=True)
 
     async def on_ready(self):
         """Handle bot ready event and initialize scheduler."""
         try:
-            logger.info(f'Bot is ready. Logged in as {self.user.name}')
+            logger.info("Bot is ready. Logged in as %s", self.user.name)
             
             if not self.scheduler:
                 logger.info("Initializing content scheduler...")
+                # Imported here so the scraper and Google API client load after login
+                from scraper.content_scheduler import ContentScheduler
                 self.scheduler = ContentScheduler(
                     self, 
                     config.NEWS_CHANNEL_ID,
@@ -100,47 +141,103 @@ class DiscordBot(commands.Bot):
                 logger.info("Content scheduler started successfully")
                 
         except Exception as e:
-            logger.error(f"Error in on_ready: {e}", exc_info=True)
+            logger.error("Error in on_ready: %s", e, exc_info=True)
+
+    async def on_message(self, message: discord.Message):
+        """Record messages in channels tracked for /prof context."""
+        recent = self._recent_messages.get(message.channel.id)
+        if recent is not None:
+            recent.append(message)
+        await self.process_commands(message)
+
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Stop sending a deleted message as /prof context."""
+        self._forget_messages(payload.channel_id, {payload.message_id})
+
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        """Stop sending bulk-deleted messages as /prof context."""
+        self._forget_messages(payload.channel_id, payload.message_ids)
+
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Send the edited text, not the original, as /prof context."""
+        content = payload.data.get('content')
+        recent = self._recent_messages.get(payload.channel_id)
+        if content is None or not recent:
+            return
+        # Seeded messages and ones that fell out of discord.py's message cache
+        # aren't updated by the library, so apply the edit here
+        for msg in recent:
+            if msg.id == payload.message_id:
+                msg.content = content
+                break
+
+    def _forget_messages(self, channel_id: int, message_ids: Set[int]) -> None:
+        """Remove the given messages from a channel's recent messages."""
+        recent = self._recent_messages.get(channel_id)
+        if not recent:
+            return
+        kept = [msg for msg in recent if msg.id not in message_ids]
+        if len(kept) != len(recent):
+            recent.clear()
+            recent.extend(kept)
 
     async def close(self):
         """Cleanup resources on shutdown."""
         if self.scheduler:
             await self.scheduler.stop()
+        await api_client.aclose()
         await super().close()
+        _log_listener.stop()
 
     @with_error_handling
     async def prof(self, interaction: discord.Interaction, prompt: str):
         """Main chat command with simplified response handling."""
         await interaction.response.defer()
         
+        # Start on the answer right away so it overlaps the thinking message send.
+        # Answer text collects in partial as it streams in.
+        partial: List[str] = []
+        response_task = asyncio.create_task(
+            self._get_answer(interaction.channel, interaction.user.id, prompt, partial)
+        )
+        
         # Send initial thinking message
         thinking_embed = self._create_embed(
             title="Thinking...",
-            description=self.thinking_phrases[0],
+            description=random.choice(THINKING_PHRASES),
             color=discord.Color.blue()
         )
-        bot_message = await interaction.followup.send(embed=thinking_embed)
+        try:
+            bot_message = await interaction.followup.send(embed=thinking_embed)
+        except Exception:
+            response_task.cancel()
+            raise
         
         try:
-            # Get response from API
-            async with api_client as client:
-                session_uuid = await client.create_chat_session()
-                context = await self._build_context(interaction.channel)
-                response = await client.get_response(session_uuid, prompt, context)
-                
-                # Create and send response embed
-                embed = self._create_embed(
-                    title="Response",
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="Question", value=prompt[:1024], inline=False)
-                embed.add_field(name="Answer", value=response[:1024], inline=False)
-                embed.set_footer(text=f"Asked by {interaction.user.display_name}")
-                
-                await bot_message.edit(embed=embed)
+            # Show the answer so far at a steady pace until it is complete. Edits are
+            # sent only when the visible field changes: nothing more once it is full,
+            # and a retried answer replaces the failed attempt's text.
+            shown = ''
+            while True:
+                done, _ = await asyncio.wait({response_task}, timeout=self.STREAM_EDIT_INTERVAL)
+                if done:
+                    break
+                text = ''.join(partial)[:self.FIELD_LIMIT]
+                if text != shown and text.strip():
+                    try:
+                        await bot_message.edit(embed=self._answer_embed(interaction, prompt, text))
+                        shown = text
+                    except discord.HTTPException as e:
+                        # Progress edits are cosmetic; the final edit still shows the answer
+                        logger.warning("Failed to show partial answer: %s", e)
+            response = response_task.result()
+            
+            if response[:self.FIELD_LIMIT] != shown:
+                await bot_message.edit(embed=self._answer_embed(interaction, prompt, response))
                 
         except Exception as e:
-            logger.error(f"Error in prof: {e}", exc_info=True)
+            response_task.cancel()
+            logger.error("Error in prof: %s", e, exc_info=True)
             error_embed = self._create_embed(
                 title="Error",
                 description="An error occurred while processing your request.",
@@ -148,6 +245,75 @@ class DiscordBot(commands.Bot):
             )
             await bot_message.edit(embed=error_embed)
 
+    async def _get_answer(self, channel: discord.TextChannel, user_id: int, prompt: str,
+                          partial: List[str]) -> str:
+        """Get the answer for a prompt, reusing a recent one when possible.
+
+        A fresh answer is streamed into ``partial`` piece by piece as it arrives.
+        """
+        session_key = (user_id, channel.id)
+        session_uuid = self._session_cache.get(session_key)
+        if session_uuid is not None:
+            # The session remembers this user's earlier turns, so its answer depends
+            # on more than prompt and context and can't come from or go into the cache
+            context = await self._build_context(channel)
+            return await self._stream_answer(session_key, session_uuid, prompt, context, partial)
+        
+        # Create the chat session while the channel context is being built
+        session_task = asyncio.create_task(api_client.create_chat_session())
+        try:
+            context = await self._build_context(channel)
+            cache_key = self._response_cache_key(prompt, context)
+            response = self._response_cache.get(cache_key)
+            
+            # Only hit the API when this question hasn't been answered recently
+            if response is None:
+                session_uuid = await session_task
+                response = await self._stream_answer(session_key, session_uuid, prompt, context, partial)
+                if response not in (EMPTY_RESPONSE, ERROR_RESPONSE):
+                    self._response_cache[cache_key] = response
+        finally:
+            # Cache hits and errors don't need the session; don't leave it running
+            if not session_task.done():
+                session_task.cancel()
+            elif not session_task.cancelled():
+                # Retrieve any failure so asyncio doesn't log it as never retrieved
+                session_task.exception()
+        return response
+
+    async def _stream_answer(self, session_key: tuple, session_uuid: str, prompt: str,
+                             context: str, partial: List[str]) -> str:
+        """Stream an answer into partial, retrying once on a new session if the stream fails.
+
+        The session that answers is kept for the user's next /prof in the channel.
+        """
+        try:
+            async for text in api_client.stream_text(session_uuid, prompt, context):
+                partial.append(text)
+        except Exception as e:
+            logger.warning("Streaming answer failed, retrying with a new session: %s", e)
+            partial.clear()
+            self._session_cache.pop(session_key, None)
+            try:
+                session_uuid = await api_client.create_chat_session()
+                async for text in api_client.stream_text(session_uuid, prompt, context):
+                    partial.append(text)
+            except Exception as retry_error:
+                logger.error("Retry failed: %s", retry_error)
+                partial.clear()
+                return ERROR_RESPONSE
+        self._session_cache[session_key] = session_uuid
+        return ''.join(partial) or EMPTY_RESPONSE
+
+    @staticmethod
+    def _response_cache_key(prompt: str, context: str) -> bytes:
+        """Hash the normalized prompt and context so cache keys stay small."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(prompt.strip().lower().encode())
+        digest.update(b'\0')
+        digest.update(context.encode())
+        return digest.digest()
+
     @staticmethod
     def _create_embed(title: str = None, description: str = None, color: discord.Color = None) -> discord.Embed:
         """Create a Discord embed with the given parameters."""
@@ -158,14 +324,58 @@ class DiscordBot(commands.Bot):
             embed.description = description
         return embed
 
-    async def _build_context(self, channel: discord.TextChannel, limit: int = 10) -> str:
+    def _answer_embed(self, interaction: discord.Interaction, prompt: str, answer: str) -> discord.Embed:
+        """Create the /prof response embed for a (possibly partial) answer."""
+        embed = self._create_embed(
+            title="Response",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Question", value=prompt[:self.FIELD_LIMIT], inline=False)
+        embed.add_field(name="Answer", value=answer[:self.FIELD_LIMIT], inline=False)
+        embed.set_footer(text=f"Asked by {interaction.user.display_name}")
+        return embed
+
+    async def _build_context(self, channel: discord.TextChannel) -> str:
         """Build context from recent channel messages."""
-        context = []
-        async for msg in channel.history(limit=limit):
-            if not msg.content.startswith('/') and msg.content.strip():
-                context.append(f"{msg.author.display_name}: {msg.content}")
+        seed = self._history_seeds.get(channel.id)
+        if seed is None and channel.id not in self._recent_messages:
+            # First use of this channel: seed from Discord once, on_message keeps it current
+            seed = asyncio.create_task(self._seed_history(channel))
+            self._history_seeds[channel.id] = seed
+        if seed is not None:
+            # Shielded so one cancelled /prof doesn't cancel the fetch for the others
+            await asyncio.shield(seed)
+        recent = self._recent_messages[channel.id]
+        
+        lines = []
+        for msg in recent:
+            content = msg.content
+            if content and not content.startswith('/') and not content.isspace():
+                lines.append(f"{msg.author.display_name}: {content}")
+        
+        return "\n".join(lines)
+
+    async def _seed_history(self, channel: discord.TextChannel) -> None:
+        """Fill a channel's recent messages from its history."""
+        # Registered before fetching so on_message records anything posted meanwhile
+        recent = deque(maxlen=self.HISTORY_SIZE)
+        self._recent_messages[channel.id] = recent
+        try:
+            history = [msg async for msg in channel.history(limit=self.HISTORY_SIZE)]
+        except BaseException:
+            # Let the next /prof try again
+            self._recent_messages.pop(channel.id, None)
+            raise
+        finally:
+            self._history_seeds.pop(channel.id, None)
         
-        return "\n".join(context)
+        # history() yields newest first; put it in chronological order ahead of
+        # whatever arrived during the fetch
+        arrived = {msg.id for msg in recent}
+        merged = [msg for msg in reversed(history) if msg.id not in arrived]
+        merged.extend(recent)
+        recent.clear()
+        recent.extend(merged)
 
     @with_error_handling
     async def generate_image(self, interaction: discord.Interaction, prompt: str, size: ImageSize = ImageSize.SQUARE):
@@ -174,7 +384,11 @@ class DiscordBot(commands.Bot):
         await interaction.followup.send("🎨 *Preparing to create your masterpiece...*")
         
         try:
-            response = self.openai_client.images.generate(
+            if self.openai_client is None:
+                # Imported on first use; the OpenAI SDK is only needed for /image
+                from openai import AsyncOpenAI
+                self.openai_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+            response = await self.openai_client.images.generate(
                 model="dall-e-3",
                 prompt=prompt,
                 size=size.value,
@@ -190,7 +404,7 @@ class DiscordBot(commands.Bot):
             )
             
         except Exception as e:
-            logger.error(f"Image generation error: {str(e)}")
+            logger.error("Image generation error: %s", e)
             await interaction.followup.send(
                 "🎨 *I apologize, but I encountered an issue creating your image.*"
             )
@@ -214,30 +428,29 @@ async def prof_command(interaction: discord.Interaction, *, prompt: str):
 )
 async def image_command(interaction: discord.Interaction, prompt: str):
     """Command handler for /image"""
-    # Parse size from flags in prompt
-    size_map = {
-        "--square": ImageSize.SQUARE,
-        "--portrait": ImageSize.PORTRAIT,
-        "--wide": ImageSize.LANDSCAPE,
-        "--landscape": ImageSize.LANDSCAPE
-    }
-    
     # Default to square if no flag found
     image_size = ImageSize.SQUARE
     clean_prompt = prompt
     
-    # Check for size flags and remove from prompt
-    for flag, size in size_map.items():
-        if flag in prompt.lower():
-            image_size = size
-            clean_prompt = prompt.lower().replace(flag, "").strip()
-            break
+    # Find the size flag in one pass and cut it out of the prompt
+    match = _SIZE_FLAG_RE.search(prompt)
+    if match:
+        image_size = _SIZE_FLAG_MAP[match.group(1).lower()]
+        clean_prompt = (prompt[:match.start()] + prompt[match.end():]).strip()
     
     await bot.generate_image(interaction, clean_prompt, image_size)
 
 if __name__ == "__main__":
     try:
-        bot.run(config.DISCORD_TOKEN)
+        # Use the libuv-based event loop where available (not on Windows)
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
+    try:
+        # Logging is configured above; don't let discord.py add its own handler
+        bot.run(config.DISCORD_TOKEN, log_handler=None)
     except ModuleNotFoundError:
         print("Discord package not found. Please install it using:")
         print("pip install discord.py")
@@ -1,5 +1,6 @@
 import asyncio
 import random
+from functools import partial
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
@@ -8,15 +9,21 @@ import re
 import discord
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 from config import config  # Changed from relative import
+from cachetools import TTLCache
 import html  # Add this import at the top
-from google.oauth2.credentials import Credentials
-import json
+import orjson
 import os
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_URL_RE = re.compile(r'https?://\S+')
+_VIDEO_ID_PATTERNS = (
+    re.compile(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*'),
+    re.compile(r'youtu.be\/([0-9A-Za-z_-]{11})')
+)
+
 class ContentScheduler:
     YOUTUBE_CHANNELS = {
         "AIExplained": "UCNJ1Ymd5yFuUPtn21xtRbbw", 
@@ -27,6 +34,7 @@ class ContentScheduler:
         "Anthropic": "UCrDwWp7EBBv4NwvScIpBDOA",
         "WesRoth":"UCqcbQf6yw5KzRoDDcZ_wBSw"
     }
+    YOUTUBE_FETCH_CONCURRENCY = 4  # Max channel searches in flight at once
     
     def __init__(self, bot, news_channel_id: int, youtube_channel_id: int):
         self.bot = bot
@@ -34,7 +42,6 @@ class ContentScheduler:
         self.youtube_channel_id = youtube_channel_id
         self.news_queue: List[Dict[str, Any]] = []  # Separate queue for news
         self.youtube_queue: List[Dict[str, Any]] = []  # Separate queue for YouTube
-        self.articles_queue = []  # Remove this or keep for backwards compatibility
         self.running = False
         self._schedule_task = None
         self._news_drip_task = None
@@ -43,9 +50,12 @@ class ContentScheduler:
         self.seen_videos = self._load_seen_videos()
         self.news_channel = None
         self.youtube_channel = None
-        self.scraped_urls = set()  # Moved here from news_scraper.py
         self.youtube = build('youtube', 'v3', developerKey=config.YOUTUBE_API_KEY)
-        self.posted_urls = set()  # Add this line to track posted URLs
+        # Posted article URLs. Only articles from the last 24h are ever queued,
+        # so a week of history is plenty and keeps the set from growing forever.
+        # Saved to disk so a restart doesn't repost articles.
+        self.posted_urls_file = 'posted_urls.json'
+        self.posted_urls = self._load_posted_urls()
 
     async def start(self) -> None:
         """Initialize and start the content scheduler."""
@@ -53,66 +63,82 @@ class ContentScheduler:
             self._initialize_channels()
             self.running = True
             
-            # Check last 100 messages in both channels
+            # Check last 100 messages in both channels concurrently
             self.seen_videos = self._load_seen_videos()
+            await asyncio.gather(
+                self._scan_youtube_history(),
+                self._scan_news_history()
+            )
             
-            # Add check of recent YouTube posts
-            async for message in self.youtube_channel.history(limit=100):
-                if message.embeds:
-                    for embed in message.embeds:
-                        if embed.url:
-                            self.seen_videos.add(embed.url)
-                            logger.info(f"Found existing video: {embed.url}")
-            
-            logger.info(f"Loaded {len(self.seen_videos)} previously posted videos")
-            
-            # Check last 100 messages in the channel to build initial posted_urls set
-            async for message in self.news_channel.history(limit=100):
-                urls = [word for word in message.content.split() 
-                       if word.startswith(("http://", "https://"))]
-                self.posted_urls.update(urls)
-                
-            logger.info(f"Loaded {len(self.posted_urls)} previously posted URLs")
+            logger.info("Loaded %s previously posted videos", len(self.seen_videos))
+            logger.info("Loaded %s previously posted URLs", len(self.posted_urls))
             
-            # Post first news article if available
+            # Post first news article and YouTube video (different channels) concurrently
             await self._fetch_content()
-            if self.news_queue:
-                article = self.news_queue.pop(0)
-                try:
-                    message = await self.news_channel.send(article['url'])
-                    await message.add_reaction("📥")
-                    self.posted_urls.add(article['url'])
-                    logger.info(f"Posted startup article URL: {article['url']}")
-                except Exception as e:
-                    logger.error(f"Failed to post startup article: {e}")
-                    self.news_queue.insert(0, article)
-            
-            # Post first YouTube video if available
-            if self.youtube_queue:
-                video = self.youtube_queue.pop(0)
-                try:
-                    embed = discord.Embed(
-                        title=video['title'],
-                        url=video['url'],
-                        color=discord.Color.red()
-                    )
-                    embed.set_image(url=video['thumbnail_url'])
-                    embed.set_footer(text=f"Posted by {video['author']}")
-                    message = await self.youtube_channel.send(embed=embed)
-                    await message.add_reaction("📥")
-                    logger.info(f"Posted startup YouTube video: {video['title']}")
-                except Exception as e:
-                    logger.error(f"Failed to post startup video: {e}")
-                    self.youtube_queue.insert(0, video)
+            await asyncio.gather(
+                self._post_startup_article(),
+                self._post_startup_video()
+            )
             
             self._start_tasks()
             logger.info("Scheduler started successfully")
             
         except Exception as e:
-            logger.error(f"Error starting scheduler: {e}", exc_info=True)
+            logger.error("Error starting scheduler: %s", e, exc_info=True)
             self.running = False
             raise
 
+    async def _post_startup_article(self) -> None:
+        """Post first news article if available."""
+        if not self.news_queue:
+            return
+        article = self.news_queue.pop(0)
+        try:
+            message = await self.news_channel.send(article['url'])
+            await message.add_reaction("📥")
+            self.posted_urls[article['url']] = True
+            self._save_posted_urls()
+            logger.info("Posted startup article URL: %s", article['url'])
+        except Exception as e:
+            logger.error("Failed to post startup article: %s", e)
+            self.news_queue.insert(0, article)
+
+    async def _post_startup_video(self) -> None:
+        """Post first YouTube video if available."""
+        if not self.youtube_queue:
+            return
+        video = self.youtube_queue.pop(0)
+        try:
+            embed = discord.Embed(
+                title=video['title'],
+                url=video['url'],
+                color=discord.Color.red()
+            )
+            embed.set_image(url=video['thumbnail_url'])
+            embed.set_footer(text=f"Posted by {video['author']}")
+            message = await self.youtube_channel.send(embed=embed)
+            await message.add_reaction("📥")
+            logger.info("Posted startup YouTube video: %s", video['title'])
+        except Exception as e:
+            logger.error("Failed to post startup video: %s", e)
+            self.youtube_queue.insert(0, video)
+
+    async def _scan_youtube_history(self, limit: int = 100) -> None:
+        """Add videos already embedded in the YouTube channel to seen_videos."""
+        async for message in self.youtube_channel.history(limit=limit):
+            if message.embeds:
+                for embed in message.embeds:
+                    if embed.url:
+                        self.seen_videos.add(embed.url)
+                        logger.info("Found existing video: %s", embed.url)
+
+    async def _scan_news_history(self, limit: int = 100) -> None:
+        """Add URLs already posted in the news channel to posted_urls."""
+        async for message in self.news_channel.history(limit=limit):
+            content = message.content
+            if "http" in content:
+                self.posted_urls.update(dict.fromkeys(_URL_RE.findall(content), True))
+
     def _initialize_channels(self) -> None:
         self.news_channel = self.bot.get_channel(self.news_channel_id)
         self.youtube_channel = self.bot.get_channel(self.youtube_channel_id)
@@ -128,6 +154,7 @@ class ContentScheduler:
 
     async def stop(self) -> None:
         self._save_seen_videos()  # Save seen videos before stopping
+        self._save_posted_urls()
         self.running = False
         for task in [self._schedule_task, self._news_drip_task, self._youtube_drip_task]:
             if task:
@@ -138,77 +165,85 @@ class ContentScheduler:
         youtube_count = 0
         
         try:
-            for channel_name, channel_id in self.YOUTUBE_CHANNELS.items():
-                try:
-                    # Create the search request
-                    request = self.youtube.search().list(
-                        part="snippet",
-                        channelId=channel_id,
-                        order="date",
-                        maxResults=5,
-                        type="video"
-                    )
-                    
-                    # Execute the request in a thread pool
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None, request.execute
-                    )
-                    
-                    for item in response.get('items', []):
-                        try:
-                            video_id = item['id']['videoId']
-                            video_url = f"https://www.youtube.com/watch?v={video_id}"
-                            
-                            # Skip if already seen
-                            if video_url in self.seen_videos:
-                                continue
-                            
-                            # Get published time
-                            published = datetime.fromisoformat(
-                                item['snippet']['publishedAt'].replace('Z', '+00:00')
-                            )
-                            
-                            # Check if recent
-                            if not self._is_recent(published):
-                                continue
-                            
-                            self.youtube_queue.append({  # Use youtube_queue instead of articles_queue
-                                'type': 'youtube',
-                                'title': html.unescape(item['snippet']['title']),  # Decode HTML entities
-                                'url': video_url,
-                                'author': channel_name,
-                                'thumbnail_url': item['snippet']['thumbnails']['high']['url'],
-                                'published': published.isoformat()
-                            })
-                            self.seen_videos.add(video_url)
-                            youtube_count += 1
-                            logger.info(f"Added video: {item['snippet']['title']}")
-                            
-                        except Exception as e:
-                            logger.error(f"Error processing video: {str(e)}")
-                            continue
-                            
-                except HttpError as e:
-                    logger.error(f"YouTube API error for channel {channel_name}: {str(e)}")
+            # Query all channels concurrently instead of one round-trip at a time
+            sem = asyncio.Semaphore(self.YOUTUBE_FETCH_CONCURRENCY)
+            results = await asyncio.gather(
+                *(self._fetch_channel_videos(sem, channel_id)
+                  for channel_id in self.YOUTUBE_CHANNELS.values()),
+                return_exceptions=True
+            )
+            
+            for channel_name, result in zip(self.YOUTUBE_CHANNELS, results):
+                if isinstance(result, HttpError):
+                    logger.error("YouTube API error for channel %s: %s", channel_name, result)
                     continue
-                except Exception as e:
-                    logger.error(f"Error fetching from channel {channel_name}: {str(e)}")
+                if isinstance(result, Exception):
+                    logger.error("Error fetching from channel %s: %s", channel_name, result)
                     continue
                     
-            logger.info(f"Successfully fetched {youtube_count} YouTube videos")
+                for item in result:
+                    try:
+                        video_id = item['id']['videoId']
+                        video_url = f"https://www.youtube.com/watch?v={video_id}"
+                        
+                        # Skip if already seen
+                        if video_url in self.seen_videos:
+                            continue
+                        
+                        # Get published time
+                        published = datetime.fromisoformat(
+                            item['snippet']['publishedAt'].replace('Z', '+00:00')
+                        )
+                        
+                        # Check if recent
+                        if not self._is_recent(published):
+                            continue
+                        
+                        self.youtube_queue.append({
+                            'type': 'youtube',
+                            'title': html.unescape(item['snippet']['title']),  # Decode HTML entities
+                            'url': video_url,
+                            'author': channel_name,
+                            'thumbnail_url': item['snippet']['thumbnails']['high']['url'],
+                            'published': published.isoformat()
+                        })
+                        self.seen_videos.add(video_url)
+                        youtube_count += 1
+                        logger.info("Added video: %s", item['snippet']['title'])
+                        
+                    except Exception as e:
+                        logger.error("Error processing video: %s", e)
+                        continue
+                    
+            logger.info("Successfully fetched %s YouTube videos", youtube_count)
             return youtube_count
             
         except Exception as e:
-            logger.error(f"Error in _fetch_youtube_videos: {str(e)}", exc_info=True)
+            logger.error("Error in _fetch_youtube_videos: %s", e, exc_info=True)
             return 0
 
+    async def _fetch_channel_videos(self, sem: asyncio.Semaphore, channel_id: str) -> List[Dict[str, Any]]:
+        """Fetch the latest search results for a single YouTube channel."""
+        async with sem:
+            # Create the search request
+            request = self.youtube.search().list(
+                part="snippet",
+                channelId=channel_id,
+                order="date",
+                maxResults=5,
+                type="video"
+            )
+            
+            # Execute the request in a thread pool. httplib2 is not thread-safe,
+            # so each concurrent request gets its own Http instance.
+            response = await asyncio.get_event_loop().run_in_executor(
+                None, partial(request.execute, http=build_http())
+            )
+            return response.get('items', [])
+
     def _extract_video_id_from_url(self, url: str) -> Optional[str]:
-        patterns = [
-            r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-            r'youtu.be\/([0-9A-Za-z_-]{11})'
-        ]
-        for pattern in patterns:
-            if match := re.search(pattern, url):
+        for pattern in _VIDEO_ID_PATTERNS:
+            if match := pattern.search(url):
                 return match.group(1)
         return None
 
@@ -276,7 +311,7 @@ class ContentScheduler:
                 if self.running:
                     await self._fetch_content()  # Changed from _fetch_all_content
             except Exception as e:
-                logger.error(f"Error in content scheduler: {e}")
+                logger.error("Error in content scheduler: %s", e)
                 await asyncio.sleep(300)
 
     async def _fetch_content(self):  # Renamed from _fetch_all_content
@@ -290,14 +325,14 @@ class ContentScheduler:
             if filtered_articles:
                 random.shuffle(filtered_articles)
                 self.news_queue.extend(filtered_articles)
-                logger.info(f"Added {len(filtered_articles)} filtered articles to news queue")
+                logger.info("Added %s filtered articles to news queue", len(filtered_articles))
             
             # Fetch YouTube videos
             youtube_count = await self._fetch_youtube_videos()
-            logger.info(f"Added {youtube_count} recent YouTube videos to YouTube queue")
+            logger.info("Added %s recent YouTube videos to YouTube queue", youtube_count)
             
         except Exception as e:
-            logger.error(f"Error during content fetch: {e}", exc_info=True)
+            logger.error("Error during content fetch: %s", e, exc_info=True)
 
     async def _drip_news(self):
         """Distribute news articles evenly across the time window until next fetch"""
@@ -318,7 +353,7 @@ class ContentScheduler:
                     if items_to_post > 0:
                         base_delay = time_window / items_to_post
                         delay = random.uniform(base_delay * 0.7, base_delay * 1.3)
-                        logger.info(f"News: Waiting {delay/60:.1f} minutes until next post")
+                        logger.info("News: Waiting %.1f minutes until next post", delay/60)
                         
                         await asyncio.sleep(delay)
                         
@@ -327,17 +362,18 @@ class ContentScheduler:
                             
                             # Skip if already posted
                             if article['url'] in self.posted_urls:
-                                logger.debug(f"Skipping already posted article: {article['url']}")
+                                logger.debug("Skipping already posted article: %s", article['url'])
                                 continue
                                 
                             try:
                                 # Simply post the URL
                                 message = await self.news_channel.send(article['url'])
                                 await message.add_reaction("📥")
-                                self.posted_urls.add(article['url'])  # Add URL to posted set
-                                logger.info(f"Posted article: {article['url']}")
+                                self.posted_urls[article['url']] = True  # Add URL to posted set
+                                self._save_posted_urls()  # Save after successful post
+                                logger.info("Posted article: %s", article['url'])
                             except Exception as e:
-                                logger.error(f"Failed to post article: {e}")
+                                logger.error("Failed to post article: %s", e)
                                 # Only add back to queue if it wasn't a duplicate
                                 if article['url'] not in self.posted_urls:
                                     self.news_queue.insert(0, article)
@@ -347,7 +383,7 @@ class ContentScheduler:
                     await asyncio.sleep(300)
                     
             except Exception as e:
-                logger.error(f"Error in news drip: {e}")
+                logger.error("Error in news drip: %s", e)
                 await asyncio.sleep(300)
 
     async def _drip_youtube(self):
@@ -373,7 +409,7 @@ class ContentScheduler:
                         
                         # Add randomness but keep within reasonable bounds
                         delay = random.uniform(base_delay * 0.7, base_delay * 1.3)
-                        logger.info(f"YouTube: Waiting {delay/60:.1f} minutes until next post")
+                        logger.info("YouTube: Waiting %.1f minutes until next post", delay/60)
                         
                         await asyncio.sleep(delay)
                         
@@ -382,7 +418,7 @@ class ContentScheduler:
                             
                             # Skip if already seen
                             if video['url'] in self.seen_videos:
-                                logger.info(f"Skipping already posted video: {video['url']}")
+                                logger.info("Skipping already posted video: %s", video['url'])
                                 continue
                                 
                             try:
@@ -397,9 +433,9 @@ class ContentScheduler:
                                 await message.add_reaction("📥")  # Add “inbox tray” reaction
                                 self.seen_videos.add(video['url'])
                                 self._save_seen_videos()  # Save after successful post
-                                logger.info(f"Posted YouTube video: {video['title']}")
+                                logger.info("Posted YouTube video: %s", video['title'])
                             except Exception as e:
-                                logger.error(f"Failed to post video: {e}")
+                                logger.error("Failed to post video: %s", e)
                                 if video['url'] not in self.seen_videos:
                                     self.youtube_queue.insert(0, video)
                     else:
@@ -408,7 +444,7 @@ class ContentScheduler:
                     await asyncio.sleep(300)
                     
             except Exception as e:
-                logger.error(f"Error in YouTube drip: {e}")
+                logger.error("Error in YouTube drip: %s", e)
                 await asyncio.sleep(300)
 
     async def _monitor_tasks(self):
@@ -424,7 +460,7 @@ class ContentScheduler:
                 for task, restart_func in tasks:
                     if task and task.done() and not task.cancelled():
                         if task.exception():
-                            logger.error(f"Task failed: {task.exception()}")
+                            logger.error("Task failed: %s", task.exception())
                             # Restart failed task
                             if task == self._schedule_task:
                                 self._schedule_task = asyncio.create_task(restart_func())
@@ -435,26 +471,43 @@ class ContentScheduler:
                                 
                 await asyncio.sleep(60)  # Check every minute
             except Exception as e:
-                logger.error(f"Error in task monitor: {e}")
+                logger.error("Error in task monitor: %s", e)
                 await asyncio.sleep(60)
 
     def _load_seen_videos(self) -> set:
         """Load previously seen videos from file."""
         try:
             if os.path.exists(self.seen_videos_file):
-                with open(self.seen_videos_file, 'r') as f:
-                    return set(json.load(f))
+                with open(self.seen_videos_file, 'rb') as f:
+                    return set(orjson.loads(f.read()))
             return set()
         except Exception as e:
-            logger.error(f"Error loading seen videos: {e}")
+            logger.error("Error loading seen videos: %s", e)
             return set()
 
     def _save_seen_videos(self) -> None:
         """Save seen videos to file."""
         try:
-            with open(self.seen_videos_file, 'w') as f:
-                json.dump(list(self.seen_videos), f)
+            with open(self.seen_videos_file, 'wb') as f:
+                f.write(orjson.dumps(list(self.seen_videos)))
         except Exception as e:
-            logger.error(f"Error saving seen videos: {e}")
+            logger.error("Error saving seen videos: %s", e)
 
-    # ...rest of existing code...
+    def _load_posted_urls(self) -> TTLCache:
+        """Load previously posted article URLs from file."""
+        posted = TTLCache(maxsize=10000, ttl=7 * 86400)
+        try:
+            if os.path.exists(self.posted_urls_file):
+                with open(self.posted_urls_file, 'rb') as f:
+                    posted.update(dict.fromkeys(orjson.loads(f.read()), True))
+        except Exception as e:
+            logger.error("Error loading posted URLs: %s", e)
+        return posted
+
+    def _save_posted_urls(self) -> None:
+        """Save posted article URLs to file."""
+        try:
+            with open(self.posted_urls_file, 'wb') as f:
+                f.write(orjson.dumps(list(self.posted_urls)))
+        except Exception as e:
+            logger.error("Error saving posted URLs: %s", e)
@@ -69,7 +69,7 @@ async def scrape_article_content(url: str, max_retries: int = 3) -> Optional[str
                     return None
 
         except Exception as e:
-            logger.error(f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
+            logger.error("Attempt %s/%s failed: %s", attempt + 1, max_retries, e)
             if attempt == max_retries - 1:
                 logger.error("All retry attempts failed")
                 return None
@@ -5,12 +5,9 @@ import aiohttp
 import feedparser
 from datetime import datetime, timedelta
 import pytz
-from time import mktime
 from email.utils import parsedate_to_datetime
 import re
-from markdownify import markdownify as md
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Removed SCRAPED_URLS = set()
@@ -63,6 +60,9 @@ RSS_FEEDS = {
     }
 }
 
+# Trailing UTC offset such as "+05:30" or "-0800"
+_TZ_OFFSET_RE = re.compile(r'[+-]\d{2}:?\d{2}$')
+
 # Keywords to filter AI-related content
 AI_KEYWORDS = [
     'artificial intelligence', 'machine learning', 'deep learning', 
@@ -70,6 +70,8 @@ AI_KEYWORDS = [
     'llm', 'gpt', 'chatgpt', 'transformer', 'openai', 'anthropic',
     'gemini', 'claude', 'mistral', 'reinforcement learning', 'ethics', 'reasoning'
 ]
+# All keywords as one alternation, so each text is scanned once
+_AI_KEYWORDS_RE = re.compile('|'.join(map(re.escape, AI_KEYWORDS)))
 
 def parse_date(date_str: str, format_type: str) -> datetime:
     """Parse date string based on source format."""
@@ -89,7 +91,7 @@ def parse_date(date_str: str, format_type: str) -> datetime:
                     return datetime.fromisoformat(date_str)
                 except ValueError:
                     # Try removing timezone and add UTC
-                    clean_date = re.sub(r'[+-]\d{2}:?\d{2}$', '', date_str)
+                    clean_date = _TZ_OFFSET_RE.sub('', date_str)
                     return datetime.fromisoformat(clean_date).replace(tzinfo=pytz.UTC)
         except ValueError:
             pass
@@ -108,11 +110,11 @@ def parse_date(date_str: str, format_type: str) -> datetime:
             except ValueError:
                 continue
 
-        logger.error(f"Could not parse date: {date_str}")
+        logger.error("Could not parse date: %s", date_str)
         return datetime.now(pytz.UTC)
         
     except Exception as e:
-        logger.error(f"Error parsing date {date_str}: {e}")
+        logger.error("Error parsing date %s: %s", date_str, e)
         return datetime.now(pytz.UTC)
 
 # Add Substack identification
@@ -128,10 +130,10 @@ def is_substack_feed(source: str, url: str) -> bool:
 # Fix the keyword error in fetch_feed function
 async def fetch_feed(session: aiohttp.ClientSession, name: str, feed_info: Dict) -> List[Dict]:
     try:
-        logger.info(f"Fetching {name} RSS feed")
+        logger.info("Fetching %s RSS feed", name)
         async with session.get(feed_info["url"]) as response:
             if response.status != 200:
-                logger.error(f"Failed to fetch {name} feed: HTTP {response.status}")
+                logger.error("Failed to fetch %s feed: HTTP %s", name, response.status)
                 return []
                 
             content = await response.text()
@@ -164,9 +166,8 @@ async def fetch_feed(session: aiohttp.ClientSession, name: str, feed_info: Dict)
                         continue
 
                     # For non-Substacks, apply keyword filtering
-                    if any(kw in entry.title.lower() or 
-                          kw in entry.get('summary', '').lower() 
-                          for kw in AI_KEYWORDS):
+                    if (_AI_KEYWORDS_RE.search(entry.title.lower()) or
+                            _AI_KEYWORDS_RE.search(entry.get('summary', '').lower())):
                         # Process article content
                         summary = entry.get('summary', '')
                         if not summary and 'description' in entry:
@@ -180,16 +181,16 @@ async def fetch_feed(session: aiohttp.ClientSession, name: str, feed_info: Dict)
                             "published": date.isoformat(),
                             "image_url": None
                         })
-                        logger.info(f"Found AI-related article from {name}: {entry.title}")
+                        logger.info("Found AI-related article from %s: %s", name, entry.title)
 
                 except Exception as e:
-                    logger.error(f"Error processing entry from {name}: {e}")
+                    logger.error("Error processing entry from %s: %s", name, e)
                     continue
             
             return articles
             
     except Exception as e:
-        logger.error(f"Error fetching {name} feed: {e}", exc_info=True)
+        logger.error("Error fetching %s feed: %s", name, e, exc_info=True)
         return []
 
 # Removed filter_new_articles function
@@ -205,16 +206,16 @@ async def scrape_all_sites() -> List[Dict]:
                 for name, feed_info in RSS_FEEDS.items()
             ]
             
-            logger.info(f"Created {len(tasks)} scraping tasks")
+            logger.info("Created %s scraping tasks", len(tasks))
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for i, result in enumerate(results):
                 source = list(RSS_FEEDS.keys())[i]
                 if isinstance(result, Exception):
-                    logger.error(f"Error scraping {source}: {result}")
+                    logger.error("Error scraping %s: %s", source, result)
                     continue
                     
-                logger.info(f"Got {len(result)} articles from {source}")
+                logger.info("Got %s articles from %s", len(result), source)
                 all_articles.extend(result)
                 
             # Sort by publication date
@@ -224,21 +225,22 @@ async def scrape_all_sites() -> List[Dict]:
                     reverse=True
                 )
             except Exception as e:
-                logger.error(f"Error sorting articles: {e}")
+                logger.error("Error sorting articles: %s", e)
             
             # Return all_articles directly now:
             return all_articles
             
     except Exception as e:
-        logger.error(f"Error in scrape_all_sites: {e}", exc_info=True)
+        logger.error("Error in scrape_all_sites: %s", e, exc_info=True)
         return []
 
 async def main():
     results = await scrape_all_sites()
     for result in results:
-        logger.info(f"Title: {result['title']}\nSource: {result['source']}\n"
-                   f"Published: {result['published']}\nURL: {result['url']}\n"
-                   f"Summary: {result['summary']}\n")
+        logger.info("Title: %s\nSource: %s\nPublished: %s\nURL: %s\nSummary: %s\n",
+                    result['title'], result['source'], result['published'],
+                    result['url'], result['summary'])
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
     asyncio.run(main())
\ No newline at end of file
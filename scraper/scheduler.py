@@ -1 +0,0 @@
-# (File intentionally left empty or removed)